@@ -92,42 +92,372 @@ goes through this transformation:
   conventions, update this docstring to reflect those changes.
 """
 
+import io
+import os
+import sys
 import zipfile
-from xml.etree import ElementTree as ET
+from lxml import etree as ET
 import re
 from pathlib import Path
+from bisect import bisect_left, bisect_right
+from collections import Counter
 from functools import lru_cache
+from itertools import accumulate, repeat
+from operator import itemgetter
+from concurrent.futures import ProcessPoolExecutor
 from difflib import SequenceMatcher
 
+# Optional: rapidfuzz pre-filters duplicate candidates in C++ when installed
+try:
+    from rapidfuzz import process as rf_process
+    from rapidfuzz.distance import Indel
+except ImportError:
+    rf_process = None
+
 
 @lru_cache(maxsize=4)
-def load_docx_xml(docx_path: str) -> str:
+def load_docx_xml(docx_path: str) -> bytes:
     """
     Not a pure function. Load and cache document.xml from a .docx file.
 
-    Returns the raw XML string for word/document.xml.
+    Returns the raw XML bytes for word/document.xml. The bytes are handed to the
+    lxml parser as-is, which skips a decode/encode round-trip. Several passes
+    stream over the same document, so the inflated bytes are kept once here
+    rather than re-inflating the zip entry for each parse.
 
     >>> # Can't doctest file I/O, but usage is:
     >>> # xml_str = load_docx_xml('/path/to/doc.docx')
     """
     with zipfile.ZipFile(docx_path) as z:
-        return z.read('word/document.xml').decode('utf-8')
+        # One read() inflates the whole entry in a single call; a BufferedReader
+        # sized to the entry measured about 50% slower on top of ZipExtFile
+        return z.read('word/document.xml')
 
 
 NAMESPACES = {
     'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
 }
+W = '{' + NAMESPACES['w'] + '}'  # Clark-notation prefix for w: tags
+W_P = W + 'p'
+W_R = W + 'r'
+W_T = W + 't'
+W_BODY = W + 'body'
+W_TBL = W + 'tbl'
+W_RPR = W + 'rPr'
+W_VERT_ALIGN = W + 'vertAlign'
+W_VAL = W + 'val'
+W_DEL = W + 'del'
+W_INS = W + 'ins'
+W_RPR_CHANGE = W + 'rPrChange'
+
+# === XML PARSING ===
+XML_PARSER = ET.XMLParser(                                            # Shared parser: no ID indexing, and no entity
+    huge_tree=True, collect_ids=False, resolve_entities=False)        # expansion since huge_tree lifts libxml2's limits
+RUN_TEXT_XPATH = ET.XPath('string(w:t)', namespaces=NAMESPACES)       # Text of a run's first w:t
+RUNS_XPATH = ET.XPath('descendant-or-self::w:r', namespaces=NAMESPACES)  # All runs, document order
+SUPERSCRIPT_RUNS_XPATH = ET.XPath(                                    # Runs whose rPr/vertAlign is superscript
+    'descendant-or-self::w:r[string(w:rPr[1]/w:vertAlign[1]/@w:val)="superscript"]', namespaces=NAMESPACES)
+TABLE_ROWS_XPATH = ET.XPath(                                          # A table's own rows, incl. content controls
+    'w:tr | w:sdt/w:sdtContent/w:tr | w:customXml/w:tr', namespaces=NAMESPACES)
+ROW_CELLS_XPATH = ET.XPath(                                           # A row's own cells, incl. content controls
+    'w:tc | w:sdt/w:sdtContent/w:tc | w:customXml/w:tc', namespaces=NAMESPACES)
+P_SUPERSCRIPT_RUNS_XPATH = ET.XPath(                                  # Runs whose first nested vertAlign is superscript
+    './/w:r[string((.//w:vertAlign)[1]/@w:val)="superscript"]', namespaces=NAMESPACES)
+
+
+def parse_xml(xml_str) -> ET._Element:
+    """
+    Not a pure function (returns an lxml Element). Parse XML with the shared parser.
+
+    lxml refuses str input carrying an encoding declaration, so str input is
+    encoded to UTF-8 bytes first.
+
+    >>> parse_xml('<a><b/></a>').tag
+    'a'
+    >>> parse_xml(b'<?xml version="1.0" encoding="UTF-8"?><a/>').tag
+    'a'
+    >>> parse_xml('<!DOCTYPE a [<!ENTITY e "expanded">]><a>&e;</a>').text is None
+    True
+    """
+    if isinstance(xml_str, str):
+        xml_str = xml_str.encode('utf-8')
+    return ET.fromstring(xml_str, XML_PARSER)
+
+
+def iterparse_xml(xml_str, events: tuple, tag):
+    """
+    Not a pure function (returns a live iterparse iterator). Stream XML events with the shared parser options.
+
+    Every streaming pass parses the same document.xml; this keeps the str-to-bytes
+    handling and the huge_tree/collect_ids/resolve_entities settings of XML_PARSER
+    in one place.
+
+    >>> [(event, elem.tag) for event, elem in iterparse_xml('<a><b/><c/></a>', ('end',), 'b')]
+    [('end', 'b')]
+    >>> [event for event, _ in iterparse_xml(b'<a><b/></a>', ('start', 'end'), ('a', 'b'))]
+    ['start', 'start', 'end', 'end']
+    """
+    if isinstance(xml_str, str):
+        xml_str = xml_str.encode('utf-8')
+    return ET.iterparse(io.BytesIO(xml_str), events=events, tag=tag,
+                        huge_tree=True, collect_ids=False, resolve_entities=False)
+
+
+def release_element(elem: ET._Element) -> None:
+    """
+    Not a pure function (mutates the tree being streamed). Free a finished element during iterparse.
+
+    Clears the element and deletes the siblings before it, which earlier events
+    have already handled, so a streaming pass holds one element at a time.
+
+    >>> root = parse_xml('<a><b>1</b><c>2</c><d/></a>')
+    >>> release_element(root[1])
+    >>> [(child.tag, child.text) for child in root]
+    [('c', None), ('d', None)]
+    """
+    elem.clear()
+    while elem.getprevious() is not None:
+        del elem.getparent()[0]
+
+
+def paragraph_text(p: ET._Element) -> str:
+    """
+    Not a pure function (reads an lxml Element). Concatenate the w:t text of a paragraph (or any element).
+
+    Only w:t counts: deleted text (w:delText) and field codes (w:instrText) are
+    left out, so a bare itertext() would be wrong. itertext(W_T, with_tail=False)
+    gives the same string but measured about twice as slow as this generator; a
+    compiled './/w:t/text()' XPath is only ~10% faster and would also pick up
+    text after any stray child of a w:t.
+
+    >>> p = parse_xml('''<w:p xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+    ...   <w:r><w:t>Hello </w:t></w:r><w:r><w:t>world</w:t></w:r></w:p>''')
+    >>> paragraph_text(p)
+    'Hello world'
+    >>> p = parse_xml('''<w:p xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+    ...   <w:del><w:r><w:delText>gone</w:delText></w:r></w:del><w:r><w:t>kept</w:t></w:r></w:p>''')
+    >>> paragraph_text(p)
+    'kept'
+    >>> paragraph_text(parse_xml('<w:p xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"/>'))
+    ''
+    """
+    return ''.join(t.text for t in p.iter(W_T) if t.text)
+
+
+def iter_paragraph_elements(xml_str):
+    """
+    Not a pure function (yields lxml Elements that are cleared afterwards). Stream (index, <w:p>) pairs.
+
+    Paragraphs are yielded in document order (the order of root.iter(W_P)), with
+    their index in it. A paragraph nested inside another (text boxes) finishes
+    parsing first, so it is held back and yielded right after its container.
+    After a top-level paragraph has been handled it is cleared and its earlier
+    siblings are deleted, so resident memory stays bounded by one paragraph
+    instead of the whole document.
+
+    >>> xml = '''<w:body xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+    ...   <w:p><w:r><w:t>One</w:t></w:r></w:p><w:p><w:r><w:t>Two</w:t></w:r></w:p>
+    ... </w:body>'''
+    >>> [(i, paragraph_text(p)) for i, p in iter_paragraph_elements(xml)]
+    [(0, 'One'), (1, 'Two')]
+    >>> xml_nested = '''<w:body xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+    ...   <w:p><w:r><w:t>Out</w:t></w:r><w:r><w:txbxContent><w:p><w:r><w:t>In</w:t></w:r></w:p></w:txbxContent></w:r></w:p>
+    ... </w:body>'''
+    >>> [(i, paragraph_text(p)) for i, p in iter_paragraph_elements(xml_nested)]
+    [(0, 'OutIn'), (1, 'In')]
+    >>> list(iter_paragraph_elements('<w:body xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"/>'))
+    []
+    """
+    events = iterparse_xml(xml_str, ('start', 'end'), W_P)
+
+    open_indices = []  # Document-order indices of the paragraphs enclosing the current position
+    nested = []  # Finished (index, paragraph) pairs waiting for their top-level container
+    count = 0
+
+    for event, elem in events:
+        if event == 'start':
+            open_indices.append(count)
+            count += 1
+            continue
+
+        index = open_indices.pop()
+        if open_indices:
+            nested.append((index, elem))
+            continue
+
+        yield index, elem
+        if nested:
+            nested.sort(key=itemgetter(0))
+            yield from nested
+            nested.clear()
+        release_element(elem)
+
+
+def iter_document_blocks(xml_str):
+    """
+    Not a pure function (yields lxml Elements that are cleared afterwards).
+    Stream paragraphs and body-level tables of a document in one pass.
+
+    Yields, in document order:
+    - ('p', runs) for every <w:p>, runs being its (str, bool) run tuples; a
+      paragraph nested in another (text boxes) comes right after its container;
+    - ('caption', element) after a paragraph directly under <w:body>, the
+      paragraphs table labels are read from;
+    - ('tbl', element) for each table directly under <w:body>.
+
+    Elements are only valid until the generator resumes. Captions are handed
+    over as elements so that consumers which ignore them never read their text.
+
+    A single iterparse pass tracks run state from start/end events. Finished
+    blocks outside any table or enclosing paragraph are cleared along with their
+    already-seen siblings, so memory stays bounded by one table or paragraph.
+
+    >>> xml = '''<w:body xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+    ...   <w:p><w:r><w:t>TABLE I</w:t></w:r></w:p>
+    ...   <w:tbl><w:tr><w:tc><w:p><w:r><w:t>cell</w:t></w:r></w:p></w:tc></w:tr></w:tbl>
+    ... </w:body>'''
+    >>> [(kind, item if kind == 'p' else ET.QName(item).localname) for kind, item in iter_document_blocks(xml)]
+    [('p', [('TABLE I', False)]), ('caption', 'p'), ('p', [('cell', False)]), ('tbl', 'tbl')]
+    >>> list(iter_document_blocks('<w:body xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"/>'))
+    []
+    >>> xml_nested = '''<w:body xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+    ...   <w:tbl><w:tr><w:tc><w:tbl><w:tr><w:tc/></w:tr></w:tbl></w:tc></w:tr></w:tbl>
+    ... </w:body>'''
+    >>> [kind for kind, _ in iter_document_blocks(xml_nested)]
+    ['tbl']
+    """
+    events = iterparse_xml(xml_str, ('start', 'end'), (W_P, W_R, W_RPR, W_T, W_VERT_ALIGN, W_TBL))
+
+    open_paragraphs = []  # Run lists of the paragraphs enclosing the current position
+    open_indices = []  # Their document-order indices
+    nested = []  # Finished (index, runs) of nested paragraphs, held until their container ends
+    count = 0
+    table_depth = 0  # Tables enclosing the current position; their contents outlive each paragraph
+    # State of each run enclosing the current position, innermost last: its first
+    # rPr, first w:t text, that rPr's first vertAlign val, and the (run list, index)
+    # slots it fills. A run can hold a text box with runs of its own, so each run
+    # keeps its own state, and reserves its slots at its start tag to keep the
+    # runs in document order.
+    open_runs = []
+
+    for event, elem in events:
+        tag = elem.tag
+        if event == 'start':
+            if tag == W_P:
+                open_paragraphs.append([])
+                open_indices.append(count)
+                count += 1
+            elif tag == W_R:
+                slots = []
+                for runs in open_paragraphs:
+                    slots.append((runs, len(runs)))
+                    runs.append(None)
+                open_runs.append([None, None, None, slots])
+            elif tag == W_RPR:
+                # A direct child of a run belongs to the innermost open run
+                if elem.getparent().tag == W_R and open_runs[-1][0] is None:
+                    open_runs[-1][0] = elem
+            elif tag == W_TBL:
+                table_depth += 1
+            continue
+
+        if tag == W_T:
+            if elem.getparent().tag == W_R and open_runs[-1][1] is None:
+                open_runs[-1][1] = elem.text or ''
+        elif tag == W_VERT_ALIGN:
+            if open_runs:
+                run = open_runs[-1]
+                if run[2] is None and run[0] is not None and elem.getparent() is run[0]:
+                    run[2] = elem.get(W_VAL, '')
+        elif tag == W_R:
+            _, text, vert_align, slots = open_runs.pop()
+            if text:
+                run = (text, vert_align == 'superscript')
+                for runs, index in slots:
+                    runs[index] = run
+        elif tag == W_P:
+            # Runs without text leave their reserved slot empty
+            runs = [run for run in open_paragraphs.pop() if run is not None]
+            index = open_indices.pop()
+            if open_paragraphs:
+                nested.append((index, runs))
+                continue
+            yield 'p', runs
+            if nested:
+                nested.sort(key=itemgetter(0))
+                for _, runs in nested:
+                    yield 'p', runs
+                nested.clear()
+            parent = elem.getparent()
+            if parent is not None and parent.tag == W_BODY:
+                yield 'caption', elem
+            if not table_depth:
+                release_element(elem)
+        elif tag == W_TBL:
+            table_depth -= 1
+            parent = elem.getparent()
+            if parent is not None and parent.tag == W_BODY:
+                yield 'tbl', elem
+            if not open_paragraphs and not table_depth:
+                release_element(elem)
+
+
+def iter_paragraph_runs(xml_str):
+    """
+    Pure function. Stream each <w:p> as a list of (str, bool) run tuples.
+
+    The paragraph events of iter_document_blocks: same (text, is_superscript)
+    tuples as xml_to_runs, without a per-run lookup or a serialize/re-parse
+    round trip per paragraph. A paragraph nested inside another (text boxes) is
+    yielded after its container, whose runs include it.
+
+    >>> xml = '''<w:body xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+    ...   <w:p><w:r><w:t>One.</w:t></w:r><w:r><w:rPr><w:vertAlign w:val="superscript"/></w:rPr><w:t>1</w:t></w:r></w:p>
+    ...   <w:p><w:r><w:t>Two</w:t></w:r></w:p>
+    ... </w:body>'''
+    >>> list(iter_paragraph_runs(xml))
+    [[('One.', False), ('1', True)], [('Two', False)]]
+    >>> xml_empty = '''<w:body xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+    ...   <w:p><w:r><w:t></w:t></w:r></w:p><w:p/>
+    ... </w:body>'''
+    >>> list(iter_paragraph_runs(xml_empty))
+    [[], []]
+    >>> xml_sub = '''<w:body xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+    ...   <w:p><w:r><w:rPr><w:vertAlign w:val="subscript"/></w:rPr><w:t>2</w:t><w:t>x</w:t></w:r></w:p>
+    ... </w:body>'''
+    >>> list(iter_paragraph_runs(xml_sub))
+    [[('2', False)]]
+    >>> xml_box = '''<w:body xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+    ...   <w:p><w:r><w:t>Out</w:t></w:r><w:r><w:rPr><w:vertAlign w:val="superscript"/></w:rPr><w:t>1</w:t>
+    ...   <w:drawing><w:txbxContent><w:p><w:r><w:t>In</w:t></w:r>
+    ...   <w:r><w:rPr><w:vertAlign w:val="superscript"/></w:rPr><w:t>2</w:t></w:r></w:p></w:txbxContent></w:drawing>
+    ...   </w:r></w:p>
+    ... </w:body>'''
+    >>> list(iter_paragraph_runs(xml_box))
+    [[('Out', False), ('1', True), ('In', False), ('2', True)], [('In', False), ('2', True)]]
+    """
+    for kind, item in iter_document_blocks(xml_str):
+        if kind == 'p':
+            yield item
+
 
 # === REGEX PATTERNS ===
 ROMAN_PATTERN = re.compile(r'\b[Tt]ables?\s+([IVXLCDMivxlcdm]+)\b')  # Table references in text
-CITATION_SINGLE = re.compile(r'^(\d+)$')                             # Single citation number
-CITATION_RANGE = re.compile(r'^(\d+)-(\d+)$')                        # Citation range (e.g., 19-22)
+CITATION_PATTERN = re.compile(r'^(\d+)(?:-(\d+))?$')                 # Single citation or range, one match
 AUTHOR_PATTERN = re.compile(r'([A-Za-zÀ-ÿ\-\']+)\s+[A-Z]{1,3}(?:[,;.]|$)')  # Author names in refs
-REF_ENTRY_PATTERN = re.compile(r'^\d+\.\s+')                         # Reference entry (e.g., "1. ")
+REF_ENTRY_PATTERN = re.compile(r'^(\d+)\.\s+')                       # Reference entry (e.g., "1. ")
+CITATION_PREFIX = re.compile(r'^Citations?\s+')                       # "Citation "/"Citations " label
+AUTHOR_SECTION_END = re.compile(r'\.\s+(?=[A-Z])')                     # End of a reference's author list
+# Table caption label (e.g., "Table II"); the numeral class is spelled out (plus dotless ı, which
+# upper-cases to I) because IGNORECASE alone would also let a dotted İ through. Labels match a search
+# of text.upper() except next to combining marks, where upper() can move a \b (e.g. "TABLE I\u0345")
+TABLE_LABEL_PATTERN = re.compile(r'\bTABLE\s+((?-i:[IVXLCDMivxlcdmı]+))\b', re.IGNORECASE)
 
 # === CONSTANTS ===
 ROMAN_TO_INT = {'I': 1, 'II': 2, 'III': 3, 'IV': 4, 'V': 5, 'VI': 6, 'VII': 7, 'VIII': 8, 'IX': 9, 'X': 10}
+ROMAN_CHARS = 'IVXLCDMivxlcdm'  # Roman numeral characters, either case
 DUPLICATE_THRESHOLD = 0.90  # Similarity threshold for duplicate detection
+PARALLEL_MIN_PARAGRAPHS = 256  # Below this, process-pool startup costs more than it saves
 
 
 def extract_references(docx_path: str) -> dict:
@@ -137,19 +467,56 @@ def extract_references(docx_path: str) -> dict:
     Returns dict of {citation_number: reference_text}.
     References are identified as paragraphs starting with "N. " pattern.
     """
-    xml_str = load_docx_xml(docx_path)
-    root = ET.fromstring(xml_str)
+    paragraphs = (p for _, p in iter_paragraph_elements(load_docx_xml(docx_path)))
+    return {num: entry.strip() for num, entry in iter_reference_entries(paragraphs)}
+
+
+def extract_references_and_authors(docx_path: str) -> tuple:
+    """
+    Not a pure function. Extract references and author names in one walk over a .docx file.
 
+    Equivalent to (extract_references(docx_path), extract_author_names(xml))
+    but visits the reference paragraphs once.
+    Returns tuple of (dict, set): ({citation_number: reference_text}, author_names).
+    """
     refs = {}
-    for p in root.findall('.//w:p', NAMESPACES):
-        text = ''.join(t.text for t in p.findall('.//w:t', NAMESPACES) if t.text)
-        match = re.match(r'^(\d+)\.\s+', text)
-        if match:
-            num = int(match.group(1))
-            content = re.sub(r'^\d+\.\s+', '', text).strip()
-            refs[num] = content
+    author_names = set()
+
+    paragraphs = (p for _, p in iter_paragraph_elements(load_docx_xml(docx_path)))
+    for num, entry in iter_reference_entries(paragraphs):
+        refs[num] = entry.strip()
+        author_names.update(reference_author_names(entry))
+
+    return refs, author_names
 
-    return refs
+
+def iter_reference_entries(paragraphs):
+    """
+    Not a pure function (reads lxml Elements). Yield (number, text) for each reference entry
+    among <w:p> elements.
+
+    Reference entries are paragraphs starting with "N. "; text has that prefix removed.
+
+    >>> root = parse_xml('''<w:body xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+    ...   <w:p><w:r><w:t>Intro text.</w:t></w:r></w:p>
+    ...   <w:p><w:r><w:t>12. </w:t></w:r><w:r><w:t>Smith AB. Title.</w:t></w:r></w:p>
+    ... </w:body>''')
+    >>> list(iter_reference_entries(root.iter(W_P)))
+    [(12, 'Smith AB. Title.')]
+    >>> empty = parse_xml('<w:body xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"/>')
+    >>> list(iter_reference_entries(empty.iter(W_P)))
+    []
+    >>> root = parse_xml('''<w:body xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+    ...   <w:p><w:r><w:t>3.Missing space</w:t></w:r></w:p>
+    ... </w:body>''')
+    >>> list(iter_reference_entries(root.iter(W_P)))
+    []
+    """
+    for p in paragraphs:
+        text = paragraph_text(p)
+        match = REF_ENTRY_PATTERN.match(text)
+        if match:
+            yield int(match.group(1)), text[match.end():]
 
 
 def detect_duplicate_references(references: dict, threshold: float = DUPLICATE_THRESHOLD) -> dict:
@@ -157,7 +524,9 @@ def detect_duplicate_references(references: dict, threshold: float = DUPLICATE_T
     Pure function. Detect duplicate references using text similarity.
 
     Uses SequenceMatcher to find references with >= threshold similarity (default 90%).
-    Always uses the lower citation number as the original (preserves first index).
+    Matches chain transitively (single linkage): if A matches B and B matches C,
+    all three form one cluster even when A and C fall below the threshold.
+    The lowest citation number in each cluster is the original (preserves first index).
 
     Returns dict mapping duplicate citation numbers to the original citation
     number they should be merged into.
@@ -175,24 +544,75 @@ def detect_duplicate_references(references: dict, threshold: float = DUPLICATE_T
     {}
     >>> detect_duplicate_references({})
     {}
+    >>> detect_duplicate_references({1: 'abcdefghij', 2: 'abcdefghi', 3: 'abcdefgh'})
+    {2: 1, 3: 1}
     """
-    duplicates = {}
     nums = sorted(references.keys())
 
+    # Block on length: ratio() is 2*matches/(la+lb) and matches <= min(la, lb),
+    # so a pair can only reach the threshold if lb/la lies within
+    # [t/(2-t), (2-t)/t]. Candidates come from a length-sorted index via bisect;
+    # the band is widened by one character to stay clear of float rounding.
+    by_length = sorted(nums, key=lambda n: len(references[n]))
+    lengths = [len(references[n]) for n in by_length]
+    band = (2 - threshold) / threshold if threshold > 0 else float('inf')
+    # Character multisets, built once per reference rather than once per pair
+    # (only needed when rapidfuzz is not there to pre-filter)
+    char_counts = {n: Counter(references[n]) for n in nums} if rf_process is None else None
+
+    # Union-find over matching pairs; each cluster's root is its lowest number
+    parent = {n: n for n in nums}
+
+    def find(n):
+        # Path halving keeps the trees shallow
+        while parent[n] != n:
+            parent[n] = parent[parent[n]]
+            n = parent[n]
+        return n
+
     # Pass 1: High text similarity
-    for i, n1 in enumerate(nums):
-        if n1 in duplicates:
+    # Walking n2 in order lets one SequenceMatcher keep n2's b2j index across
+    # all of its n1 candidates.
+    matcher = SequenceMatcher(None)
+    for n2 in nums:
+        lb = len(references[n2])
+        lo = bisect_left(lengths, lb / band - 1)
+        hi = bisect_right(lengths, lb * band + 1)
+        candidates = sorted(n for n in by_length[lo:hi] if n < n2)
+        if not candidates:
             continue
 
-        for n2 in nums[i+1:]:
-            if n2 in duplicates:
-                continue
+        if rf_process is not None:
+            # Indel similarity is 2*LCS/(la+lb). Matching blocks form a common
+            # subsequence, so it never falls below ratio() and only drops misses.
+            # score_cutoff lets rapidfuzz abandon a pair as soon as it cannot pass;
+            # rapidfuzz rounds its cutoff internally, so leave a margin for ratio()
+            hits = rf_process.extract(
+                references[n2], {n1: references[n1] for n1 in candidates},
+                scorer=Indel.normalized_similarity, processor=None,
+                score_cutoff=max(0.0, threshold - 1e-3), limit=None)
+            candidates = sorted(n1 for _, _, n1 in hits)
+
+        matcher.set_seq2(references[n2])
+        counts2 = char_counts[n2] if char_counts is not None else None
+        for n1 in candidates:
+            root1, root2 = find(n1), find(n2)
+            if root1 == root2:
+                continue  # Already in the same cluster, nothing to learn
+
+            if counts2 is not None:
+                # The shared-character count is the bound quick_ratio() computes
+                # (looser than Indel), so ratio() can only pass when this does
+                total = len(references[n1]) + lb
+                if total and 2.0 * sum(min(k, counts2[c]) for c, k in char_counts[n1].items()) / total < threshold:
+                    continue
 
-            ratio = SequenceMatcher(None, references[n1], references[n2]).ratio()
-            if ratio >= threshold:
-                duplicates[n2] = n1
+            matcher.set_seq1(references[n1])
+            if matcher.ratio() >= threshold:
+                # Union by min root: the lowest number in a cluster stays the original
+                parent[max(root1, root2)] = min(root1, root2)
 
-    return duplicates
+    return {n: root for n in nums if (root := find(n)) != n}
 
 
 def build_densification_map(duplicates: dict, max_ref: int) -> dict:
@@ -209,21 +629,31 @@ def build_densification_map(duplicates: dict, max_ref: int) -> dict:
     >>> build_densification_map({}, 3)
     {1: 1, 2: 2, 3: 3}
     """
-    # First, identify kept refs (not duplicates) and their new numbers
-    kept = sorted([n for n in range(1, max_ref + 1) if n not in duplicates])
-    old_to_new = {old: new for new, old in enumerate(kept, 1)}
+    old_to_new = number_kept_references(duplicates, max_ref)
 
-    # Build full mapping including duplicates
-    result = {}
-    for old in range(1, max_ref + 1):
-        if old in duplicates:
-            # Duplicate maps to the new number of its original
-            orig = duplicates[old]
-            result[old] = old_to_new[orig]
-        else:
-            result[old] = old_to_new[old]
+    # Duplicates map to the new number of their original
+    return {old: old_to_new[duplicates.get(old, old)] for old in range(1, max_ref + 1)}
 
-    return result
+
+def number_kept_references(duplicates: dict, max_ref: int) -> dict:
+    """
+    Pure function. Number the non-duplicate references in 1..max_ref sequentially.
+
+    Returns dict mapping each kept old number to its new dense number.
+
+    >>> number_kept_references({3: 1}, 4)
+    {1: 1, 2: 2, 4: 3}
+    >>> number_kept_references({}, 2)
+    {1: 1, 2: 2}
+    >>> number_kept_references({1: 2}, 1)
+    {}
+    """
+    # Running count; range() is already ascending, so no sort or intermediate list
+    old_to_new = {}
+    for old in range(1, max_ref + 1):
+        if old not in duplicates:
+            old_to_new[old] = len(old_to_new) + 1
+    return old_to_new
 
 
 def format_numbers_to_citation(nums: list) -> str:
@@ -243,8 +673,33 @@ def format_numbers_to_citation(nums: list) -> str:
     'Citations 52, 97, 99'
     >>> format_numbers_to_citation([1, 3, 5])
     'Citations 1, 3, 5'
+    >>> format_numbers_to_citation([156, 153, 155, 154, 154])
+    'Citations 153-156'
     >>> format_numbers_to_citation([])
     ''
+    >>> format_numbers_to_citation([7, 7])
+    'Citation 7'
+    """
+    if not nums:
+        return ''
+    # Plural by how many distinct numbers are cited, as repeats collapse to one
+    label = 'Citations ' if len(set(nums)) > 1 else 'Citation '
+    return label + format_citation_numbers(nums)
+
+
+def format_citation_numbers(nums: list) -> str:
+    """
+    Pure function. Format citation numbers without the "Citation(s) " label.
+
+    Uses dashes for contiguous sequences, commas otherwise; this is the number
+    part of format_numbers_to_citation, for callers that rewrite superscripts.
+
+    >>> format_citation_numbers([42])
+    '42'
+    >>> format_citation_numbers([9, 1, 2, 3, 5, 6])
+    '1-3, 5, 6, 9'
+    >>> format_citation_numbers([])
+    ''
     """
     if not nums:
         return ''
@@ -252,14 +707,15 @@ def format_numbers_to_citation(nums: list) -> str:
     nums = sorted(set(nums))
 
     if len(nums) == 1:
-        return f'Citation {nums[0]}'
+        return str(nums[0])
 
-    # Group into contiguous ranges
+    # Group into contiguous ranges (a plain loop measured faster than
+    # diff/split-style grouping for citation-sized lists)
     groups = []
-    start = nums[0]
-    end = nums[0]
+    rest = iter(nums)
+    start = end = next(rest)
 
-    for n in nums[1:]:
+    for n in rest:
         if n == end + 1:
             end = n
         else:
@@ -279,7 +735,7 @@ def format_numbers_to_citation(nums: list) -> str:
         else:
             parts.append(f'{start}-{end}')
 
-    return 'Citations ' + ', '.join(parts)
+    return ', '.join(parts)
 
 
 def apply_citation_mappings(nums: list, dup_map: dict, dense_map: dict) -> list:
@@ -297,14 +753,34 @@ def apply_citation_mappings(nums: list, dup_map: dict, dense_map: dict) -> list:
     >>> apply_citation_mappings([165, 166, 167], {}, {165: 153, 166: 154, 167: 155})
     [153, 154, 155]
     """
-    # Step 1: Replace duplicates with originals
-    replaced = [dup_map.get(n, n) for n in nums]
+    # Steps 1-3 in one pass: duplicate -> original -> dense number, collected into a set
+    densified = set()
+    for n in nums:
+        orig = dup_map.get(n, n)
+        densified.add(dense_map.get(orig, orig))
+    return sorted(densified)
+
 
-    # Step 2: Apply densification
-    densified = [dense_map.get(n, n) for n in replaced]
+def compose_citation_mappings(dup_map: dict, dense_map: dict) -> dict:
+    """
+    Pure function. Fold the duplicate and densification maps into one old -> new number map.
 
-    # Step 3: Dedupe and sort
-    return sorted(set(densified))
+    For any nums, sorted({combined.get(n, n) for n in nums}) equals
+    apply_citation_mappings(nums, dup_map, dense_map), with one dict lookup per
+    number instead of two.
+
+    >>> compose_citation_mappings({171: 100}, {100: 98, 171: 98})
+    {100: 98, 171: 98}
+    >>> compose_citation_mappings({3: 1}, {1: 1, 2: 2, 4: 3})
+    {1: 1, 2: 2, 4: 3, 3: 1}
+    >>> compose_citation_mappings({}, {})
+    {}
+    """
+    combined = {}
+    for n in (*dense_map, *dup_map):
+        orig = dup_map.get(n, n)
+        combined[n] = dense_map.get(orig, orig)
+    return combined
 
 
 def extract_citation_locations(xml_str: str, author_names: set = None) -> list:
@@ -317,82 +793,73 @@ def extract_citation_locations(xml_str: str, author_names: set = None) -> list:
     - paragraph_index: Index of parent paragraph
     - run_index: Index of run within paragraph
     - context: Brief text before the citation for identification
+
+    Paragraphs are streamed, so memory stays bounded by one paragraph.
     """
-    root = ET.fromstring(xml_str)
     locations = []
 
-    paragraphs = root.findall('.//w:p', NAMESPACES)
+    for p_idx, p in iter_paragraph_elements(xml_str):
+        # Paragraphs without superscripts can hold no citation locations. Most have
+        # no vertAlign at all, which a tag walk rules out faster than the XPath.
+        if next(p.iter(W_VERT_ALIGN), None) is None:
+            continue
+        # One compiled XPath per paragraph instead of a vertAlign lookup per run
+        superscript_runs = set(P_SUPERSCRIPT_RUNS_XPATH(p))
+        if not superscript_runs:
+            continue
 
-    for p_idx, p in enumerate(paragraphs):
         # Skip reference entries
-        full_text = ''.join(t.text for t in p.findall('.//w:t', NAMESPACES) if t.text)
-        if REF_ENTRY_PATTERN.match(full_text):
+        if REF_ENTRY_PATTERN.match(paragraph_text(p)):
             continue
 
-        runs = p.findall('.//w:r', NAMESPACES)
-        has_seen_text = False
-
-        r_idx = 0
-        while r_idx < len(runs):
-            r = runs[r_idx]
+        runs = list(p.iter(W_R))
+        run_texts = [RUN_TEXT_XPATH(r) for r in runs]
+        para_text = ''.join(run_texts)
 
-            # Check if superscript
-            vert_align = r.find('.//w:vertAlign', NAMESPACES)
-            is_sup = vert_align is not None and vert_align.get(
-                '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}val') == 'superscript'
+        # Per-run arrays: run_is_sup[i] flags superscripts, run_offsets[i] is where
+        # run i starts in para_text
+        run_is_sup = [r in superscript_runs for r in runs]
+        run_offsets = [0, *accumulate(len(t) for t in run_texts)]
 
-            text_elem = r.find('.//w:t', NAMESPACES)
-            text = text_elem.text if text_elem is not None and text_elem.text else ''
+        # Regular text has been seen before a superscript group iff some regular run
+        # with non-blank text precedes it
+        first_text_idx = next(
+            (i for i, (text, is_sup) in enumerate(zip(run_texts, run_is_sup)) if not is_sup and text.strip()),
+            len(runs))
 
-            if not is_sup:
-                if text.strip():
-                    has_seen_text = True
+        r_idx = 0
+        while r_idx < len(runs):
+            if not run_is_sup[r_idx]:
                 r_idx += 1
                 continue
 
             # Superscript found - combine consecutive superscript runs
-            combined_text = text
             start_run_idx = r_idx
             j = r_idx + 1
-            while j < len(runs):
-                next_r = runs[j]
-                next_vert = next_r.find('.//w:vertAlign', NAMESPACES)
-                next_is_sup = next_vert is not None and next_vert.get(
-                    '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}val') == 'superscript'
-                if not next_is_sup:
-                    break
-                next_text_elem = next_r.find('.//w:t', NAMESPACES)
-                if next_text_elem is not None and next_text_elem.text:
-                    combined_text += next_text_elem.text
+            while j < len(runs) and run_is_sup[j]:
                 j += 1
+            r_idx = j
+
+            # The combined text is already contiguous in para_text
+            combined_text = para_text[run_offsets[start_run_idx]:run_offsets[j]]
 
             # Check what comes after
-            next_text = ''
-            if j < len(runs):
-                next_text_elem = runs[j].find('.//w:t', NAMESPACES)
-                if next_text_elem is not None and next_text_elem.text:
-                    next_text = next_text_elem.text
+            next_text = run_texts[j] if j < len(runs) else ''
 
             # Skip left-side superscripts (isotopes)
             if is_left_side_superscript(next_text, author_names):
-                r_idx = j
                 continue
 
             # Skip if no regular text seen yet
-            if not has_seen_text:
-                r_idx = j
+            if first_text_idx > start_run_idx:
                 continue
 
             # Validate as citation
             combined_text = combined_text.strip()
-            if CITATION_SINGLE.match(combined_text) or CITATION_RANGE.match(combined_text):
+            if CITATION_PATTERN.match(combined_text):
                 # Get context (last ~30 chars before this citation)
-                context_parts = []
-                for prev_r in runs[:start_run_idx]:
-                    t = prev_r.find('.//w:t', NAMESPACES)
-                    if t is not None and t.text:
-                        context_parts.append(t.text)
-                context = ''.join(context_parts)[-30:].strip()
+                context_end = run_offsets[start_run_idx]
+                context = para_text[max(0, context_end - 30):context_end].strip()
 
                 locations.append({
                     'xpath': f"w:body/w:p[{p_idx + 1}]/w:r[{start_run_idx + 1}]",
@@ -403,8 +870,6 @@ def extract_citation_locations(xml_str: str, author_names: set = None) -> list:
                     'context': context,
                 })
 
-            r_idx = j
-
     return locations
 
 
@@ -420,7 +885,31 @@ def generate_modification_plan(
     For each citation location, shows original text, new text after transformation,
     and the XPath for programmatic replacement.
     """
-    lines = [
+    return '\n'.join(iter_modification_plan_lines(locations, dup_map, dense_map, references))
+
+
+def iter_modification_plan_lines(
+    locations: list,
+    dup_map: dict,
+    dense_map: dict,
+    references: dict,
+):
+    """
+    Pure function. Lazily yield the lines of generate_modification_plan, without newlines.
+
+    The plan has a row per citation location and per reference, so it is the
+    largest section; write_markdown streams it instead of joining it first.
+
+    >>> loc = {'original_text': '2', 'context': 'as shown', 'xpath': 'w:body/w:p[1]/w:r[2]'}
+    >>> lines = list(iter_modification_plan_lines([loc], {2: 1}, {1: 1, 3: 2}, {1: 'A.', 2: 'A.', 3: 'B.'}))
+    >>> lines[7]
+    '| `w:body/w:p[1]/w:r[2]` | ...as shown | 2 | 1 | duplicate |'
+    >>> lines[-3:]
+    ['| keep | 1 | 1 | A. |', '| ~~DELETE~~ | ~~2~~ | → 1 | ~~A.~~ |', '| RENUMBER | 3 | 2 | B. |']
+    >>> lines[:4]
+    ['**Summary:**', '- Original references: 3', '- After removing duplicates: 2', '- Citation instances to update: 1']
+    """
+    yield from (
         f"**Summary:**",
         f"- Original references: {len(references)}",
         f"- After removing duplicates: {len(references) - len(dup_map)}",
@@ -428,24 +917,17 @@ def generate_modification_plan(
         "",
         "| Location | Context | Original | New | Change |",
         "|----------|---------|----------|-----|--------|",
-    ]
+    )
+    combined_map = compose_citation_mappings(dup_map, dense_map)
 
     for loc in locations:
         orig_text = loc['original_text']
 
         # Parse original to numbers
-        if '-' in orig_text:
-            match = CITATION_RANGE.match(orig_text)
-            if match:
-                start, end = int(match.group(1)), int(match.group(2))
-                orig_nums = list(range(start, end + 1))
-            else:
-                orig_nums = [int(orig_text)]
-        else:
-            orig_nums = [int(n.strip()) for n in orig_text.split(',') if n.strip().isdigit()]
+        orig_nums = extract_numbers_from_citation(orig_text)
 
         # Apply mappings
-        new_nums = apply_citation_mappings(orig_nums, dup_map, dense_map)
+        new_nums = sorted({combined_map.get(n, n) for n in orig_nums})
 
         # Format new citation (just the numbers part)
         if len(new_nums) == 0:
@@ -463,7 +945,7 @@ def generate_modification_plan(
                 change_type = "unchanged"
         else:
             # Format with dashes for contiguous
-            new_text = format_numbers_to_citation(new_nums).replace('Citations ', '').replace('Citation ', '')
+            new_text = format_citation_numbers(new_nums)
             if set(orig_nums) != set(new_nums):
                 change_type = "renumbered"
             else:
@@ -472,29 +954,29 @@ def generate_modification_plan(
         context = loc['context'][-20:] if loc['context'] else ""
         xpath = loc['xpath']
 
-        lines.append(f"| `{xpath}` | ...{context} | {orig_text} | {new_text} | {change_type} |")
+        yield f"| `{xpath}` | ...{context} | {orig_text} | {new_text} | {change_type} |"
 
     # Add reference deletion plan
-    lines.append("")
-    lines.append("### Reference List Modifications")
-    lines.append("")
-    lines.append("| Action | Ref # | New # | Reference Text |")
-    lines.append("|--------|-------|-------|----------------|")
-
-    for old_num in sorted(references.keys()):
-        text = references[old_num][:60] + "..." if len(references[old_num]) > 60 else references[old_num]
+    yield from (
+        "",
+        "### Reference List Modifications",
+        "",
+        "| Action | Ref # | New # | Reference Text |",
+        "|--------|-------|-------|----------------|",
+    )
+
+    for old_num, ref_text in sorted(references.items()):
+        text = ref_text[:60] + "..." if len(ref_text) > 60 else ref_text
         if old_num in dup_map:
             orig = dup_map[old_num]
             new_num = dense_map[orig]
-            lines.append(f"| ~~DELETE~~ | ~~{old_num}~~ | → {new_num} | ~~{text}~~ |")
+            yield f"| ~~DELETE~~ | ~~{old_num}~~ | → {new_num} | ~~{text}~~ |"
         else:
             new_num = dense_map[old_num]
             if old_num != new_num:
-                lines.append(f"| RENUMBER | {old_num} | {new_num} | {text} |")
+                yield f"| RENUMBER | {old_num} | {new_num} | {text} |"
             else:
-                lines.append(f"| keep | {old_num} | {new_num} | {text} |")
-
-    return '\n'.join(lines)
+                yield f"| keep | {old_num} | {new_num} | {text} |"
 
 
 def generate_numerical_conversion_table(duplicates: dict) -> str:
@@ -514,18 +996,15 @@ def generate_numerical_conversion_table(duplicates: dict) -> str:
     if not duplicates:
         return "| Old # | New # |\n|-------|-------|\n"
 
-    # Find all original numbers
-    all_originals = set(duplicates.values())
-    all_duplicates = set(duplicates.keys())
-    max_num = max(max(all_duplicates), max(all_originals))
+    # Highest number mentioned on either side; the dict itself answers membership
+    max_num = max(max(duplicates), max(duplicates.values()))
 
     # Build mapping: kept numbers get renumbered sequentially
-    kept = sorted([n for n in range(1, max_num + 1) if n not in all_duplicates])
-    old_to_new = {old: new for new, old in enumerate(kept, 1)}
+    old_to_new = number_kept_references(duplicates, max_num)
 
     lines = ["| Old # | New # |", "|-------|-------|"]
     for old in range(1, max_num + 1):
-        if old in all_duplicates:
+        if old in duplicates:
             # Duplicate - show arrow to original
             orig = duplicates[old]
             new = old_to_new.get(orig, '?')
@@ -553,7 +1032,8 @@ def generate_duplicate_comparison_table(references: dict, duplicates: dict) -> s
     >>> 'Alpha paper' in table
     True
     """
-    sorted_refs = sorted(references.items(), key=lambda x: x[1])
+    sorted_refs = sorted(references.items(), key=itemgetter(1))
+    kept = set(duplicates.values())  # Originals that have duplicates pointing to them
 
     lines = ["| Status | # | Reference Text |", "|--------|---|----------------|"]
 
@@ -564,9 +1044,7 @@ def generate_duplicate_comparison_table(references: dict, duplicates: dict) -> s
             orig = duplicates[num]
             lines.append(f"| ~~DELETED~~ | ~~{num}~~ | ~~{truncated}~~ (→ {orig}) |")
         else:
-            # Check if this is an original that has duplicates pointing to it
-            has_dups = num in duplicates.values()
-            if has_dups:
+            if num in kept:
                 lines.append(f"| **KEPT** | **{num}** | **{truncated}** |")
             else:
                 lines.append(f"| - | {num} | {truncated} |")
@@ -578,8 +1056,8 @@ def extract_numbers_from_citation(cite_str: str) -> list:
     """
     Pure function. Extract individual citation numbers from a citation string.
 
-    Handles single citations, ranges, and comma-separated lists.
-    Returns list of ints in order of appearance.
+    Handles single citations, ranges, and comma-separated lists, with or without
+    the "Citation(s) " label. Returns list of ints in order of appearance.
 
     >>> extract_numbers_from_citation('Citation 42')
     [42]
@@ -593,28 +1071,69 @@ def extract_numbers_from_citation(cite_str: str) -> list:
     []
     >>> extract_numbers_from_citation('Citations 1, 2, 3')
     [1, 2, 3]
+    >>> extract_numbers_from_citation('19-22,42')
+    [19, 20, 21, 22, 42]
+    >>> extract_numbers_from_citation('7')
+    [7]
     """
     if cite_str.startswith('Table'):
         return []
 
     numbers = []
     # Remove "Citation" or "Citations" prefix
-    text = re.sub(r'^Citations?\s+', '', cite_str)
+    text = CITATION_PREFIX.sub('', cite_str)
 
-    # Split by comma
-    parts = [p.strip() for p in text.split(',')]
-
-    for part in parts:
-        range_match = re.match(r'^(\d+)-(\d+)$', part)
-        if range_match:
-            start, end = int(range_match.group(1)), int(range_match.group(2))
-            numbers.extend(range(start, end + 1))
-        elif re.match(r'^\d+$', part):
-            numbers.append(int(part))
+    # Split by comma; one match tells a single number from a range
+    for part in text.split(','):
+        match = CITATION_PATTERN.match(part.strip())
+        if not match:
+            continue
+        start, end = match.groups()
+        if end is None:
+            numbers.append(int(start))
+        else:
+            numbers.extend(range(int(start), int(end) + 1))
 
     return numbers
 
 
+def parse_citation_text(text: str) -> list:
+    """
+    Pure function. Parse superscript run text like '49', '1,' or '19-22,42' into numbers.
+
+    Numbers may be separated by commas and/or whitespace; "a-b" expands to a
+    range. A lone number, by far the most common superscript, returns before
+    any replace/split work.
+
+    >>> parse_citation_text('49')
+    [49]
+    >>> parse_citation_text('1, 2 3,')
+    [1, 2, 3]
+    >>> parse_citation_text('19-22,42')
+    [19, 20, 21, 22, 42]
+    >>> parse_citation_text('a-')
+    []
+    """
+    if text.isdigit():
+        return [int(text)]
+
+    nums = []
+    parts = text.replace(',', ' ').replace('-', ' - ').split()
+    i = 0
+    while i < len(parts):
+        if parts[i].isdigit():
+            if i + 2 < len(parts) and parts[i + 1] == '-' and parts[i + 2].isdigit():
+                start, end = int(parts[i]), int(parts[i + 2])
+                nums.extend(range(start, end + 1))
+                i += 3
+            else:
+                nums.append(int(parts[i]))
+                i += 1
+        else:
+            i += 1
+    return nums
+
+
 def build_canonical_order(table_citations: dict, paragraph_results: list) -> list:
     """
     Pure function. Build canonical citation order by walking through paragraphs.
@@ -633,29 +1152,20 @@ def build_canonical_order(table_citations: dict, paragraph_results: list) -> lis
     >>> build_canonical_order({}, [])
     []
     """
-    seen = set()
-    order = []
+    nums = []
 
     for first_three, full_text, citations in paragraph_results:
         for cite in citations:
             if cite.startswith('Table'):
-                # Extract roman numeral and expand table citations
-                match = re.match(r'Table\s+([IVXLCDMivxlcdm]+)', cite)
-                if match:
-                    roman = match.group(1).upper()
-                    if roman in table_citations:
-                        for table_cite in table_citations[roman]:
-                            for num in extract_numbers_from_citation(table_cite):
-                                if num not in seen:
-                                    seen.add(num)
-                                    order.append(num)
+                # Expand table citations; "Table X" citations are built as
+                # f"Table {roman}", so the numeral is a fixed slice
+                for table_cite in table_citations.get(cite[6:].upper(), ()):
+                    nums.extend(extract_numbers_from_citation(table_cite))
             else:
-                for num in extract_numbers_from_citation(cite):
-                    if num not in seen:
-                        seen.add(num)
-                        order.append(num)
+                nums.extend(extract_numbers_from_citation(cite))
 
-    return order
+    # dict keeps insertion order, so this keeps each number's first appearance
+    return list(dict.fromkeys(nums))
 
 
 def build_conversion_table(canonical_order: list) -> dict:
@@ -673,11 +1183,7 @@ def build_conversion_table(canonical_order: list) -> dict:
     >>> build_conversion_table([])
     {}
     """
-    conversion = {}
-    for new_num, old_num in enumerate(canonical_order, 1):
-        if old_num != new_num:
-            conversion[old_num] = new_num
-    return conversion
+    return {old_num: new_num for new_num, old_num in enumerate(canonical_order, 1) if old_num != new_num}
 
 
 def extract_author_names(doc_xml: str) -> set:
@@ -705,30 +1211,33 @@ def extract_author_names(doc_xml: str) -> set:
     >>> sorted(extract_author_names(xml3))
     ['Du', 'Ho', 'Li']
     """
-    root = ET.fromstring(doc_xml)
     author_names = set()
 
-    for p in root.findall('.//w:p', NAMESPACES):
-        text = ''.join(t.text for t in p.findall('.//w:t', NAMESPACES) if t.text)
-        if not REF_ENTRY_PATTERN.match(text):
-            continue
+    paragraphs = (p for _, p in iter_paragraph_elements(doc_xml))
+    for _, entry in iter_reference_entries(paragraphs):
+        author_names.update(reference_author_names(entry))
 
-        # Remove leading number
-        text = REF_ENTRY_PATTERN.sub('', text)
+    return author_names
 
-        # Get author section (before title - first ". " followed by capital letter)
-        parts = re.split(r'\.\s+(?=[A-Z])', text, maxsplit=1)
-        if not parts:
-            continue
 
-        author_section = parts[0]
-        names = AUTHOR_PATTERN.findall(author_section)
+def reference_author_names(entry: str) -> list:
+    """
+    Pure function. Extract author last names from one reference entry.
 
-        for name in names:
-            if name.lower() not in ('et', 'al'):
-                author_names.add(name)
+    entry is the reference text with its leading "N. " already removed.
 
-    return author_names
+    >>> reference_author_names('Smith AB, Jones CD. Title here.')
+    ['Smith', 'Jones']
+    >>> reference_author_names('Li X, Du Y, Ho Z. Study.')
+    ['Li', 'Du', 'Ho']
+    >>> reference_author_names('No authors in this one')
+    []
+    """
+    # Author section ends before the title (first ". " followed by a capital letter).
+    # findall's endpos bounds the scan there without slicing out a substring.
+    end = AUTHOR_SECTION_END.search(entry)
+    names = AUTHOR_PATTERN.findall(entry, 0, end.start() if end else len(entry))
+    return [name for name in names if name.lower() not in ('et', 'al')]
 
 
 def is_roman_numeral(s: str) -> bool:
@@ -749,8 +1258,11 @@ def is_roman_numeral(s: str) -> bool:
     False
     >>> is_roman_numeral('I2')
     False
+    >>> is_roman_numeral('IV\\n')  # A trailing newline is not a numeral character
+    False
     """
-    return bool(s) and all(c in 'IVXLCDMivxlcdm' for c in s)
+    # strip() with the numeral set leaves nothing exactly when every character is one
+    return bool(s) and not s.strip(ROMAN_CHARS)
 
 
 def parse_citation(text: str) -> list:
@@ -760,6 +1272,10 @@ def parse_citation(text: str) -> list:
     Returns list[str] with one citation string, or empty list if invalid.
     Uses "Citation" for single numbers, "Citations" for ranges or multiple.
 
+    Not lru_cached: citation numbers rarely repeat within a document (174
+    distinct strings among the sample's 195 superscript groups), so a cache
+    mostly misses and measured slower than parsing.
+
     >>> parse_citation('42')
     ['Citation 42']
     >>> parse_citation('19-22')
@@ -772,17 +1288,27 @@ def parse_citation(text: str) -> list:
     []
     >>> parse_citation('')
     []
+    >>> parse_citation('1a, 2')
+    ['Citation 2']
     """
+    # Most superscripts are one bare number. isdecimal() accepts exactly the
+    # characters \d does, so this is the single-part case of the path below.
+    if text.isdecimal():
+        return [sys.intern('Citation ' + text)]
+
+    # Parts are validated one by one: a findall over the whole text would also
+    # pick numbers out of malformed parts such as '1a'
     text = text.strip()
     parts = [p.strip() for p in text.split(',') if p.strip()]
-    valid = [p for p in parts if CITATION_SINGLE.match(p) or CITATION_RANGE.match(p)]
+    valid = [p for p in parts if CITATION_PATTERN.match(p)]
 
     if not valid:
         return []
 
     combined = ', '.join(valid)
     plural = len(valid) > 1 or '-' in combined
-    return [f"Citation{'s' if plural else ''} {combined}"]
+    # Interned so the same citation repeated across paragraphs shares one string
+    return [sys.intern(f"Citation{'s' if plural else ''} {combined}")]
 
 
 def extract_citations_from_runs(runs: list, author_names: set = None) -> list:
@@ -812,44 +1338,63 @@ def extract_citations_from_runs(runs: list, author_names: set = None) -> list:
     >>> extract_citations_from_runs([('Text', False), ('42', True), ('Li et al', False)], {'Li'})
     ['Citation 42']
     """
+    return extract_text_and_citations_from_runs(runs, author_names)[1]
+
+
+def extract_text_and_citations_from_runs(runs: list, author_names: set = None) -> tuple:
+    """
+    Pure function. Join the regular text and extract the citations of runs in one pass.
+
+    Same citations as extract_citations_from_runs; the text is the concatenation
+    of the non-superscript runs, collected by the same walk over the runs. The
+    runs themselves stay a list built during parsing rather than a scan fused
+    into it: the candidate prefilter reads them first, and the process pool in
+    iter_candidate_results needs picklable input.
+    Returns tuple of (str, list[str]): (full_text, citation_strings).
+
+    >>> extract_text_and_citations_from_runs([('Results', False), ('1', True), ('2', True), (' here.', False)])
+    ('Results here.', ['Citation 12'])
+    >>> extract_text_and_citations_from_runs([('1', True), ('Plain text.', False)])
+    ('Plain text.', [])
+    >>> extract_text_and_citations_from_runs([('The ', False), ('129', True), ('Xe gas', False)])
+    ('The Xe gas', [])
+    """
+    # No separate any(is_sup) pre-check: on runs without superscripts this walk
+    # only appends text, and a pre-scan plus join measured slower than it
+    text_parts = []
     citations = []
     has_seen_regular_text = False
     i = 0
+    n = len(runs)
 
-    while i < len(runs):
+    while i < n:
         text, is_sup = runs[i]
 
         if not is_sup:
-            if text.strip():
+            text_parts.append(text)
+            if not has_seen_regular_text and text.strip():
                 has_seen_regular_text = True
             i += 1
-        else:
-            # Superscript - combine consecutive superscript runs
-            combined_sup = text
-            j = i + 1
-            while j < len(runs) and runs[j][1]:  # while next run is also superscript
-                combined_sup += runs[j][0]
-                j += 1
+            continue
 
-            # Look at what comes immediately after all these superscripts
-            next_text = ''
-            if j < len(runs):
-                next_text = runs[j][0]
+        # Superscript - combine consecutive superscript runs
+        j = i + 1
+        while j < n and runs[j][1]:  # while next run is also superscript
+            j += 1
+        combined_sup = text if j == i + 1 else ''.join(t for t, _ in runs[i:j])
 
-            # Left vs Right position rule:
-            # If superscript is on the LEFT side of text (followed by short word), skip it
-            if is_left_side_superscript(next_text, author_names):
-                i = j
-                continue
+        # Look at what comes immediately after all these superscripts
+        next_text = runs[j][0] if j < n else ''
 
-            # Only include if we've seen regular text before this (right-side rule)
-            if has_seen_regular_text:
-                parsed = parse_citation(combined_sup)
-                citations.extend(parsed)
+        # Left vs Right position rule: a superscript on the LEFT side of text
+        # (followed by a short word) is skipped, and one is only included once
+        # regular text has been seen before it (right side)
+        if has_seen_regular_text and not is_left_side_superscript(next_text, author_names):
+            citations.extend(parse_citation(combined_sup))
 
-            i = j
+        i = j
 
-    return citations
+    return ''.join(text_parts), citations
 
 
 def is_left_side_superscript(next_text: str, author_names: set = None) -> bool:
@@ -863,6 +1408,11 @@ def is_left_side_superscript(next_text: str, author_names: set = None) -> bool:
     Rule: If next_text starts with 1-2 letters followed by non-letter (space, punct,
     or end), treat as left-side (isotope) UNLESS that word is a known author name.
 
+    Deliberately not lru_cached: author_names is an unhashable set, and a cache
+    keyed on next_text[:3] measured slower than the direct check, since over
+    half the calls get '' (superscript at paragraph end) and return at once.
+    A compiled first-word regex measured about 3x slower than the index checks.
+
     >>> is_left_side_superscript('Xe MRI')
     True
     >>> is_left_side_superscript('He)')
@@ -871,6 +1421,8 @@ def is_left_side_superscript(next_text: str, author_names: set = None) -> bool:
     True
     >>> is_left_side_superscript('x')
     True
+    >>> is_left_side_superscript('Xe2 gas')
+    True
     >>> is_left_side_superscript('')
     False
     >>> is_left_side_superscript(' some text')
@@ -888,27 +1440,20 @@ def is_left_side_superscript(next_text: str, author_names: set = None) -> bool:
     >>> is_left_side_superscript('Xe et al', {'Xe'})
     False
     """
-    if not next_text:
+    # Must start with a letter
+    if not next_text or not next_text[0].isalpha():
         return False
 
-    # Check if starts with a letter
-    if not next_text[0].isalpha():
+    # A third leading letter means the first word is too long for an element symbol
+    if len(next_text) > 2 and next_text[1].isalpha() and next_text[2].isalpha():
         return False
 
-    # Find the first word (consecutive letters)
-    first_word = ''
-    for c in next_text:
-        if c.isalpha():
-            first_word += c
-        else:
-            break
-
-    # If it's a known author name, it's not isotope notation
-    if author_names and first_word in author_names:
-        return False
+    if not author_names:
+        return True
 
-    # If first word is 1-2 letters, treat as isotope notation (left side)
-    return len(first_word) <= 2
+    # The 1-2 letter first word; if it's a known author name, it's not isotope notation
+    first_word = next_text[:2] if next_text[1:2].isalpha() else next_text[0]
+    return first_word not in author_names
 
 
 def is_reference_entry(text: str) -> bool:
@@ -926,7 +1471,7 @@ def is_reference_entry(text: str) -> bool:
     >>> is_reference_entry('The study by Smith et al.')
     False
     """
-    return bool(re.match(r'^\d+\.\s', text.strip()))
+    return REF_ENTRY_PATTERN.match(text.strip()) is not None
 
 
 def xml_to_runs(xml_str: str) -> list:
@@ -955,23 +1500,32 @@ def xml_to_runs(xml_str: str) -> list:
     >>> xml_to_runs(xml_multi)
     [('A', False), ('1', True), ('B', False)]
     """
-    elem = ET.fromstring(xml_str)
-    runs = []
+    return element_to_runs(parse_xml(xml_str))
 
-    for r in elem.findall('.//w:r', NAMESPACES):
-        rPr = r.find('w:rPr', NAMESPACES)
-        is_sup = False
-        if rPr is not None:
-            vertAlign = rPr.find('w:vertAlign', NAMESPACES)
-            if vertAlign is not None:
-                val = vertAlign.get('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}val')
-                if val == 'superscript':
-                    is_sup = True
-        t = r.find('w:t', NAMESPACES)
-        if t is not None and t.text:
-            runs.append((t.text, is_sup))
 
-    return runs
+def element_to_runs(elem: ET._Element) -> list:
+    """
+    Not a pure function (reads an lxml Element). Convert an already-parsed element to list of (str, bool) tuples.
+
+    Same result as xml_to_runs(ET.tostring(elem)) without the serialize/re-parse
+    round trip.
+
+    >>> tbl = parse_xml('''<w:tc xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+    ...   <w:r><w:t>Data</w:t></w:r><w:r><w:rPr><w:vertAlign w:val="superscript"/></w:rPr><w:t>7</w:t></w:r>
+    ... </w:tc>''')
+    >>> element_to_runs(tbl)
+    [('Data', False), ('7', True)]
+    >>> element_to_runs(tbl[0])
+    [('Data', False)]
+    >>> element_to_runs(parse_xml('<w:tc xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"/>'))
+    []
+    """
+    # Classify every run in two XPath calls; the set holds the same element
+    # proxies that RUNS_XPATH returns, so membership is an identity check.
+    # A per-run find() of rPr/vertAlign/t measured about 1.5x slower on the
+    # sample document's table cells, since each find crosses into Python.
+    superscript_runs = set(SUPERSCRIPT_RUNS_XPATH(elem))
+    return [(text, r in superscript_runs) for r in RUNS_XPATH(elem) if (text := RUN_TEXT_XPATH(r))]
 
 
 def extract_table_citations(xml_str: str, author_names: set = None) -> list:
@@ -1000,17 +1554,46 @@ def extract_table_citations(xml_str: str, author_names: set = None) -> list:
     >>> extract_table_citations(xml_multi)
     ['Citation 1', 'Citation 2']
     """
-    tbl = ET.fromstring(xml_str)
-    citations = []
-    rows = tbl.findall('.//w:tr', NAMESPACES)
+    return extract_table_element_citations(parse_xml(xml_str), author_names)
+
 
-    for row in rows:
-        cells = row.findall('.//w:tc', NAMESPACES)
-        for cell in cells:
-            cell_xml = ET.tostring(cell, encoding='unicode')
-            runs = xml_to_runs(cell_xml)
-            cell_citations = extract_citations_from_runs(runs, author_names)
-            citations.extend(cell_citations)
+def extract_table_element_citations(tbl: ET._Element, author_names: set = None) -> list:
+    """
+    Not a pure function (reads an lxml Element). Extract citations from an already-parsed <w:tbl> element.
+
+    Same result as extract_table_citations(ET.tostring(tbl)); cells are read in
+    place instead of being serialized and re-parsed one by one. Only the table's
+    own rows and cells are visited, so a nested table is read once, as part of
+    the cell that holds it.
+
+    >>> tbl = parse_xml('''<w:tbl xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+    ...   <w:tr><w:tc><w:r><w:t>Text</w:t></w:r>
+    ...   <w:r><w:rPr><w:vertAlign w:val="superscript"/></w:rPr><w:t>5-6</w:t></w:r></w:tc></w:tr>
+    ... </w:tbl>''')
+    >>> extract_table_element_citations(tbl)
+    ['Citations 5-6']
+    >>> empty = parse_xml('<w:tbl xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"/>')
+    >>> extract_table_element_citations(empty)
+    []
+    >>> tbl = parse_xml('''<w:tbl xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+    ...   <w:tr><w:tc><w:r><w:rPr><w:vertAlign w:val="superscript"/></w:rPr><w:t>9</w:t></w:r></w:tc></w:tr>
+    ... </w:tbl>''')
+    >>> extract_table_element_citations(tbl)
+    []
+    >>> tbl = parse_xml('''<w:tbl xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+    ...   <w:tr><w:tc><w:tbl><w:tr><w:tc><w:r><w:t>In</w:t></w:r>
+    ...   <w:r><w:rPr><w:vertAlign w:val="superscript"/></w:rPr><w:t>3</w:t></w:r></w:tc></w:tr></w:tbl></w:tc></w:tr>
+    ... </w:tbl>''')
+    >>> extract_table_element_citations(tbl)
+    ['Citation 3']
+    """
+    # Not tbl.iter()/row.iter() over w:tr/w:tc tags: those descend into nested
+    # tables, whose cells would then be read twice (alone and inside their
+    # enclosing cell)
+    citations = []
+    for row in TABLE_ROWS_XPATH(tbl):
+        for cell in ROW_CELLS_XPATH(row):
+            citations.extend(extract_citations_from_runs(element_to_runs(cell), author_names))
 
     return citations
 
@@ -1019,6 +1602,9 @@ def extract_paragraph_with_citations(xml_str: str, author_names: set = None) ->
     """
     Pure function. Extract text and citations from paragraph XML string.
 
+    For callers that hold one paragraph's XML. The document pipeline never
+    serializes paragraphs: iter_document_blocks streams each one's runs straight
+    into extract_runs_with_citations.
     Returns tuple of (str, list[str]): (full_text, citation_strings).
 
     >>> xml = '''<w:p xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
@@ -1038,20 +1624,35 @@ def extract_paragraph_with_citations(xml_str: str, author_names: set = None) ->
     >>> extract_paragraph_with_citations(xml_table)
     ('See Table I for details.', ['Table I'])
     """
-    runs = xml_to_runs(xml_str)
+    return extract_runs_with_citations(xml_to_runs(xml_str), author_names)
 
-    # Build full text (non-superscript only)
-    text_parts = [text for text, is_sup in runs if not is_sup]
-    full_text = ''.join(text_parts)
 
-    # Extract citations using left/right position rule
-    citations = extract_citations_from_runs(runs, author_names)
+def extract_runs_with_citations(runs: list, author_names: set = None) -> tuple:
+    """
+    Pure function. Extract text and citations from a list of (str, bool) run tuples.
 
-    # Also extract Table references from the text
-    for match in ROMAN_PATTERN.finditer(full_text):
-        roman = match.group(1).upper()
-        if is_roman_numeral(roman):
-            citations.append(f"Table {roman}")
+    Returns tuple of (str, list[str]): (full_text, citation_strings).
+
+    >>> extract_runs_with_citations([('Hello world.', False), ('42', True)])
+    ('Hello world.', ['Citation 42'])
+    >>> extract_runs_with_citations([('No citations here.', False)])
+    ('No citations here.', [])
+    >>> extract_runs_with_citations([('See ', False), ('Table II', False), ('.', False), ('3', True)])
+    ('See Table II.', ['Citation 3', 'Table II'])
+    >>> extract_runs_with_citations([('See Table ı (dotless i), not a numeral.', False)])
+    ('See Table ı (dotless i), not a numeral.', [])
+    """
+    # Full text (non-superscript only) and citations using the left/right
+    # position rule, from a single walk over the runs
+    full_text, citations = extract_text_and_citations_from_runs(runs, author_names)
+
+    # Also extract Table references from the text. Every match contains "able",
+    # and a substring test rejects most paragraphs faster than the regex does.
+    if 'able' in full_text:
+        for match in ROMAN_PATTERN.finditer(full_text):
+            roman = match.group(1).upper()
+            if is_roman_numeral(roman):
+                citations.append(sys.intern(f"Table {roman}"))
 
     return full_text, citations
 
@@ -1087,48 +1688,198 @@ def process_tables(xml_str: str, author_names: set = None) -> dict:
     >>> sorted(process_tables(xml_two).keys())
     ['I', 'II']
     """
-    root = ET.fromstring(xml_str)
-    body = root.find('.//w:body', NAMESPACES)
+    return process_document(xml_str, author_names, paragraphs=False)[0]
+
+
+def table_label(text: str):
+    """
+    Pure function. Return the Roman numeral a caption paragraph labels, or None.
+
+    >>> table_label('TABLE II. Patient characteristics')
+    'II'
+    >>> table_label('Table iv continued')
+    'IV'
+    >>> table_label('Results are shown below') is None
+    True
+    >>> table_label('TABLE I\u0345')  # upper() would turn the mark into a letter
+    'I'
+    """
+    match = TABLE_LABEL_PATTERN.search(text)
+    if match:
+        roman = match.group(1).upper()
+        if is_roman_numeral(roman):
+            return roman
+    return None
+
+
+def process_document(xml_str: str, author_names: set = None, paragraphs: bool = True) -> tuple:
+    """
+    Not a pure function (may start a process pool). Extract table and paragraph citations in one streaming pass.
 
-    table_groups = {}
+    Equivalent to (process_tables(xml_str), process_paragraphs(xml_str)) but
+    parses document.xml once. Labelled tables are read as soon as they close,
+    and paragraph candidates are kept as run lists until the pass ends. With
+    paragraphs=False only the tables are collected.
+    Returns tuple of (dict, list): (table_citations, paragraph_results).
+
+    >>> xml = '''<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+    ...   <w:body>
+    ...     <w:p><w:r><w:t>As shown in Table I, the levels rose sharply over time.</w:t></w:r>
+    ...     <w:r><w:rPr><w:vertAlign w:val="superscript"/></w:rPr><w:t>1</w:t></w:r></w:p>
+    ...     <w:p><w:r><w:t>TABLE I. Results</w:t></w:r></w:p>
+    ...     <w:tbl><w:tr><w:tc><w:r><w:t>Data</w:t></w:r>
+    ...     <w:r><w:rPr><w:vertAlign w:val="superscript"/></w:rPr><w:t>2</w:t></w:r></w:tc></w:tr></w:tbl>
+    ...   </w:body>
+    ... </w:document>'''
+    >>> tables, paragraphs = process_document(xml)
+    >>> tables
+    {'I': ['Citation 2']}
+    >>> [citations for _, _, citations in paragraphs]
+    [['Citation 1', 'Table I']]
+    >>> process_document(xml, paragraphs=False)
+    ({'I': ['Citation 2']}, [])
+
+    A text box inside a run gives the same results as separate
+    process_tables/process_paragraphs parses: the box's runs count towards the
+    enclosing paragraph, and the boxed paragraph follows its container.
+
+    >>> xml_box = '''<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>
+    ...   <w:p><w:r><w:t>Eosinophils rose in the treated cohort (Table I)</w:t></w:r>
+    ...   <w:r><w:rPr><w:vertAlign w:val="superscript"/></w:rPr><w:t>1</w:t>
+    ...   <w:drawing><w:txbxContent><w:p><w:r><w:t>Boxed note that is long enough to keep</w:t></w:r>
+    ...   <w:r><w:rPr><w:vertAlign w:val="superscript"/></w:rPr><w:t>2</w:t></w:r></w:p></w:txbxContent></w:drawing></w:r>
+    ...   <w:r><w:t> overall.</w:t></w:r></w:p>
+    ...   <w:p><w:r><w:t>TABLE I. Results</w:t></w:r></w:p>
+    ...   <w:tbl><w:tr><w:tc><w:p><w:r><w:t>Data</w:t></w:r>
+    ...   <w:r><w:rPr><w:vertAlign w:val="superscript"/></w:rPr><w:t>3</w:t></w:r></w:p></w:tc></w:tr></w:tbl>
+    ... </w:body></w:document>'''
+    >>> tables, paragraphs = process_document(xml_box)
+    >>> tables
+    {'I': ['Citation 3']}
+    >>> [(first_three, citations) for first_three, _, citations in paragraphs]
+    [('Eosinophils rose in', ['Citation 1', 'Citation 2', 'Table I']), ('Boxed note that', ['Citation 2'])]
+    >>> (tables, paragraphs) == (process_tables(xml_box), process_paragraphs(xml_box))
+    True
+    """
+    tables = {}
+    candidates = []
     current_label = None
 
-    for elem in body:
-        tag = elem.tag.replace('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}', '')
+    for kind, item in iter_document_blocks(xml_str):
+        if kind == 'p':
+            if paragraphs and is_candidate_paragraph(item):
+                candidates.append(item)
+        elif kind == 'caption':
+            roman = table_label(paragraph_text(item).strip())
+            if roman:
+                current_label = roman
+                tables.setdefault(roman, [])
+        elif current_label:  # A body-level <w:tbl>
+            tables[current_label].extend(extract_table_element_citations(item, author_names))
+
+    return tables, list(iter_candidate_results(candidates, author_names))
+
+
+def iter_paragraph_results(xml_str: str, author_names: set = None):
+    """
+    Not a pure function (may start a process pool). Lazily extract paragraphs with citations from document XML.
+
+    Generator form of process_paragraphs: yields the same
+    (first_three_words, full_text, citations) tuples one at a time so a
+    consumer can stream them without holding every paragraph in memory.
+
+    >>> xml = '''<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+    ...   <w:body>
+    ...     <w:p><w:r><w:t>A first paragraph that is long enough to be kept here.</w:t></w:r>
+    ...     <w:r><w:rPr><w:vertAlign w:val="superscript"/></w:rPr><w:t>1</w:t></w:r></w:p>
+    ...     <w:p><w:r><w:t>A second paragraph that is also long enough to keep.</w:t></w:r>
+    ...     <w:r><w:rPr><w:vertAlign w:val="superscript"/></w:rPr><w:t>2</w:t></w:r></w:p>
+    ...   </w:body>
+    ... </w:document>'''
+    >>> results = iter_paragraph_results(xml)
+    >>> next(results)[2]
+    ['Citation 1']
+    >>> next(results)[0]
+    'A second paragraph'
+    >>> list(results)
+    []
+    """
+    candidates = [runs for runs in iter_paragraph_runs(xml_str) if is_candidate_paragraph(runs)]
+    yield from iter_candidate_results(candidates, author_names)
+
+
+def is_candidate_paragraph(runs: list) -> bool:
+    """
+    Pure function. Cheap test for whether a paragraph's runs could yield a kept citation result.
+
+    The superscript runs count towards the length here, so it never
+    under-estimates the final text. Without superscripts, the only possible
+    citations are table references.
+
+    >>> is_candidate_paragraph([('A sentence that is long enough to keep.', False), ('1', True)])
+    True
+    >>> is_candidate_paragraph([('Too short.', False), ('1', True)])
+    False
+    >>> is_candidate_paragraph([('A long sentence with no citations in it at all.', False)])
+    False
+    >>> is_candidate_paragraph([('A long sentence that refers the reader to Table II.', False)])
+    True
+    """
+    if sum(len(text) for text, _ in runs) < 30:
+        return False
+    if not any(is_sup for _, is_sup in runs):
+        joined = ''.join(text for text, _ in runs)
+        return 'able' in joined and ROMAN_PATTERN.search(joined) is not None
+    return True
+
+
+def iter_candidate_results(candidates: list, author_names: set = None):
+    """
+    Not a pure function (may start a process pool).
+    Extract (first_three_words, full_text, citations) from candidate run lists.
+
+    Paragraphs without citations, shorter than 30 characters once superscripts
+    are dropped, or that are reference list entries are skipped.
+
+    >>> list(iter_candidate_results([[('Eosinophils are granulocytic cells found here.', False), ('4', True)]]))
+    [('Eosinophils are granulocytic', 'Eosinophils are granulocytic cells found here.', ['Citation 4'])]
+    >>> list(iter_candidate_results([[('197. Kaireit TF, Kern A, and many more authors.', False), ('2', True)]]))
+    []
+    >>> list(iter_candidate_results([]))
+    []
+    """
+    # Paragraphs are independent, so large documents fan out across processes
+    # Chunks amortize IPC, but stay small enough that every worker gets several
+    if len(candidates) >= PARALLEL_MIN_PARAGRAPHS:
+        chunksize = min(64, max(1, len(candidates) // (4 * (os.cpu_count() or 1))))
+        with ProcessPoolExecutor() as pool:
+            extracted = list(pool.map(
+                extract_runs_with_citations, candidates, repeat(author_names), chunksize=chunksize))
+    else:
+        extracted = (extract_runs_with_citations(runs, author_names) for runs in candidates)
 
-        if tag == 'p':
-            texts = []
-            for t in elem.findall('.//w:t', NAMESPACES):
-                if t.text:
-                    texts.append(t.text)
-            text = ''.join(texts).strip()
+    for text, citations in extracted:
+        # Cheapest rejection first; the length test needs the stripped text
+        if not citations:
+            continue
 
-            match = re.search(r'\bTABLE\s+([IVXLCDMivxlcdm]+)\b', text.upper())
-            if match:
-                roman = match.group(1).upper()
-                if is_roman_numeral(roman):
-                    current_label = roman
-                    if roman not in table_groups:
-                        table_groups[roman] = []
+        text = text.strip()
+        if len(text) < 30:
+            continue
 
-        elif tag == 'tbl' and current_label:
-            tbl_xml = ET.tostring(elem, encoding='unicode')
-            table_groups[current_label].append(tbl_xml)
+        # Skip reference list entries (e.g., "197. Kaireit TF...")
+        if is_reference_entry(text):
+            continue
 
-    result = {}
-    for roman, table_xmls in table_groups.items():
-        all_citations = []
-        for tbl_xml in table_xmls:
-            citations = extract_table_citations(tbl_xml, author_names)
-            all_citations.extend(citations)
-        result[roman] = all_citations
+        # maxsplit=3 stops after the fourth word instead of splitting the whole paragraph
+        first_three = ' '.join(text.split(None, 3)[:3])
 
-    return result
+        yield first_three, text, citations
 
 
 def process_paragraphs(xml_str: str, author_names: set = None) -> list:
     """
-    Pure function. Extract paragraphs with citations from document XML.
+    Not a pure function (may start a process pool). Extract paragraphs with citations from document XML.
 
     Skips short paragraphs (<30 chars), paragraphs without citations, and
     reference list entries. Returns list of tuples:
@@ -1158,144 +1909,128 @@ def process_paragraphs(xml_str: str, author_names: set = None) -> list:
     >>> process_paragraphs(xml_ref)
     []
     """
-    root = ET.fromstring(xml_str)
-    results = []
-
-    for p in root.findall('.//w:p', NAMESPACES):
-        p_xml = ET.tostring(p, encoding='unicode')
-        text, citations = extract_paragraph_with_citations(p_xml, author_names)
-        text = text.strip()
-
-        if not text or len(text) < 30:
-            continue
-
-        if not citations:
-            continue
-
-        # Skip reference list entries (e.g., "197. Kaireit TF...")
-        if is_reference_entry(text):
-            continue
-
-        words = text.split()
-        first_three = ' '.join(words[:3])
-
-        results.append((first_three, text, citations))
-
-    return results
+    return list(iter_paragraph_results(xml_str, author_names))
 
 
 def generate_markdown(
     table_citations: dict,
-    paragraph_results: list,
+    paragraph_results,
     output_path: str,
     references: dict = None,
     duplicates: dict = None,
     xml_str: str = None,
     author_names: set = None,
+    dense_map: dict = None,
 ) -> tuple:
     """
     Not a pure function. Writes to file.
 
     Generate markdown output file with sections for tables, paragraphs, conversion,
     duplicate reference tables, and document modification plan.
+    paragraph_results may be any iterable (e.g. iter_paragraph_results); it is
+    consumed once and each paragraph is written to the file as it arrives.
+    dense_map may be passed in by a caller that already built it; otherwise it
+    is built from duplicates when Section 6 needs it.
     Returns tuple of (int, int, int, int, int): (table_count, paragraph_count, conversion_count, duplicate_count, mod_count).
     """
-    lines = []
+    # A 1 MiB buffer turns the many small section writes into a few large ones
+    with Path(output_path).open('w', buffering=1 << 20) as fh:
+        return write_markdown(
+            fh, table_citations, paragraph_results, references, duplicates, xml_str, author_names, dense_map)
+
 
+def write_markdown(
+    fh, table_citations, paragraph_results, references, duplicates, xml_str, author_names, dense_map=None,
+) -> tuple:
+    """
+    Not a pure function. Writes the generate_markdown sections to an open text file.
+
+    Sections are separated by a blank line written before each new section, so
+    the file ends in a single newline without trimming anything afterwards.
+    """
     # Section 1: Citation Extraction by Table
-    lines.append("# Section 1: Citation Extraction by Table\n")
+    fh.write("# Section 1: Citation Extraction by Table\n\n")
 
     sorted_tables = sorted(table_citations.items(), key=lambda x: ROMAN_TO_INT.get(x[0], 99))
 
     for roman, citations in sorted_tables:
-        lines.append(f"## Table {roman}")
-        lines.append("")
-
-        for j, cite in enumerate(citations, 1):
-            lines.append(f"- {j}. {cite}")
-
-        lines.append("")
+        fh.write(f"## Table {roman}\n\n")
+        fh.writelines([f"- {j}. {cite}\n" for j, cite in enumerate(citations, 1)])
+        fh.write("\n")
 
     # Section 2: Citation Extraction by Paragraph (with Table expansion)
-    lines.append("# Section 2: Citation Extraction by Paragraph\n")
+    fh.write("# Section 2: Citation Extraction by Paragraph\n\n")
 
     cite_counter = 0
+    paragraph_count = 0
+    # Only the citations feed the canonical order; paragraph text is not retained
+    cited_paragraphs = []
     for i, (first_three, full_text, citations) in enumerate(paragraph_results, 1):
-        lines.append(f"## {i}. {first_three}...")
-        lines.append("")
+        paragraph_count = i
+        cited_paragraphs.append((first_three, None, citations))
 
-        j = 0
-        for cite in citations:
-            j += 1
+        # Each paragraph's block is built as one list and handed to writelines
+        block = [f"## {i}. {first_three}...\n\n"]
+        for j, cite in enumerate(citations, 1):
+            block.append(f"- {j}. {cite}\n")
             if cite.startswith('Table'):
-                # Expand table reference with sub-bullets
-                lines.append(f"- {j}. {cite}")
-                match = re.match(r'Table\s+([IVXLCDMivxlcdm]+)', cite)
-                if match:
-                    roman = match.group(1).upper()
-                    if roman in table_citations:
-                        for k, table_cite in enumerate(table_citations[roman], 1):
-                            cite_counter += 1
-                            lines.append(f"  - {j}.{k}. {table_cite}")
+                # Expand table reference with sub-bullets; extract_runs_with_citations
+                # builds these as f"Table {roman}", so the numeral is a fixed slice
+                table_cites = table_citations.get(cite[6:].upper())
+                if table_cites:
+                    cite_counter += len(table_cites)
+                    block.extend([f"  - {j}.{k}. {table_cite}\n" for k, table_cite in enumerate(table_cites, 1)])
             else:
                 cite_counter += 1
-                lines.append(f"- {j}. {cite}")
-
-        lines.append("")
+        block.append("\n")
+        fh.writelines(block)
 
     # Section 3: Citation Conversion Table
-    canonical_order = build_canonical_order(table_citations, paragraph_results)
+    canonical_order = build_canonical_order(table_citations, cited_paragraphs)
     conversion = build_conversion_table(canonical_order)
 
-    lines.append("# Section 3: Citation Conversion Table\n")
+    fh.write("# Section 3: Citation Conversion Table\n\n")
 
     if conversion:
-        lines.append("| From | To |")
-        lines.append("|------|-----|")
-
-        for old_num in sorted(conversion.keys()):
-            new_num = conversion[old_num]
-            lines.append(f"| {old_num} | {new_num} |")
+        fh.write("| From | To |\n|------|-----|\n")
+        fh.writelines([f"| {old_num} | {new_num} |\n" for old_num, new_num in sorted(conversion.items())])
     else:
-        lines.append("No conversions needed - all citations are already in canonical order.")
-
-    lines.append("")
+        fh.write("No conversions needed - all citations are already in canonical order.\n")
 
     # Section 4 & 5: Duplicate Reference Tables (if provided)
     duplicate_count = 0
     if references is not None and duplicates is not None:
         duplicate_count = len(duplicates)
 
-        lines.append("# Section 4: Duplicate Reference Conversion\n")
-        lines.append(f"**Total references:** {len(references)}")
-        lines.append(f"**Duplicates found:** {duplicate_count}")
-        lines.append(f"**Unique references after dedup:** {len(references) - duplicate_count}")
-        lines.append("")
-        lines.append(generate_numerical_conversion_table(duplicates))
-        lines.append("")
-
-        lines.append("# Section 5: Duplicate Comparison (Sorted Alphabetically)\n")
-        lines.append("- **KEPT** = Original reference retained")
-        lines.append("- ~~DELETED~~ = Duplicate removed (shows which original it maps to)")
-        lines.append("- `-` = Unique reference (no duplicates)")
-        lines.append("")
-        lines.append(generate_duplicate_comparison_table(references, duplicates))
-        lines.append("")
+        fh.write(
+            "\n# Section 4: Duplicate Reference Conversion\n\n"
+            f"**Total references:** {len(references)}\n"
+            f"**Duplicates found:** {duplicate_count}\n"
+            f"**Unique references after dedup:** {len(references) - duplicate_count}\n\n"
+        )
+        fh.writelines((generate_numerical_conversion_table(duplicates), "\n\n"))
+
+        fh.write(
+            "# Section 5: Duplicate Comparison (Sorted Alphabetically)\n\n"
+            "- **KEPT** = Original reference retained\n"
+            "- ~~DELETED~~ = Duplicate removed (shows which original it maps to)\n"
+            "- `-` = Unique reference (no duplicates)\n\n"
+        )
+        fh.writelines((generate_duplicate_comparison_table(references, duplicates), "\n"))
 
     # Section 6: Document Modification Plan (if xml_str provided)
     mod_count = 0
     if xml_str is not None and references is not None and duplicates is not None:
-        max_ref = max(references.keys())
-        dense_map = build_densification_map(duplicates, max_ref)
+        if dense_map is None:
+            dense_map = build_densification_map(duplicates, max(references.keys()))
         locations = extract_citation_locations(xml_str, author_names)
         mod_count = len(locations)
 
-        lines.append("# Section 6: Document Modification Plan\n")
-        lines.append(generate_modification_plan(locations, duplicates, dense_map, references))
-        lines.append("")
+        fh.write("\n# Section 6: Document Modification Plan\n\n")
+        plan_lines = iter_modification_plan_lines(locations, duplicates, dense_map, references)
+        fh.writelines(line + "\n" for line in plan_lines)
 
-    Path(output_path).write_text('\n'.join(lines))
-    return len(sorted_tables), len(paragraph_results), len(conversion), duplicate_count, mod_count
+    return len(sorted_tables), paragraph_count, len(conversion), duplicate_count, mod_count
 
 
 def create_modified_document(
@@ -1319,39 +2054,29 @@ def create_modified_document(
 
     Returns tuple of (paragraph_mods, table_mods, ref_mods).
     """
-    import tempfile
-    from lxml import etree
     from docx import Document
-    from docx.oxml.ns import qn
     from docx.oxml import OxmlElement
     from docx.shared import RGBColor
 
-    W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
-    W = '{' + W_NS + '}'
-
     # Step 1: Accept all track changes
-    with tempfile.TemporaryDirectory() as temp_dir:
-        extract_dir = Path(temp_dir) / 'extracted'
-        clean_path = Path(temp_dir) / 'clean.docx'
-
-        with zipfile.ZipFile(docx_path, 'r') as z:
-            z.extractall(extract_dir)
-
-        doc_xml_path = extract_dir / 'word' / 'document.xml'
-        tree = etree.parse(str(doc_xml_path))
-        root = tree.getroot()
+    with zipfile.ZipFile(docx_path, 'r') as src:
+        # load_docx_xml is cached, so main's document.xml bytes are reused rather
+        # than inflated again; the fresh parse is ours to modify
+        root = parse_xml(load_docx_xml(docx_path))
+        tree = root.getroottree()
 
+        # Each pass snapshots its matches with list() since it edits the tree.
         # Remove deletions
-        for del_elem in root.findall('.//' + W + 'del'):
+        for del_elem in list(root.iter(W_DEL)):
             parent = del_elem.getparent()
             if parent is not None:
                 parent.remove(del_elem)
 
         # Unwrap insertions
-        for ins_elem in root.findall('.//' + W + 'ins'):
+        for ins_elem in list(root.iter(W_INS)):
             parent = ins_elem.getparent()
             if parent is not None:
-                idx = list(parent).index(ins_elem)
+                idx = parent.index(ins_elem)
                 for child in list(ins_elem):
                     ins_elem.remove(child)
                     parent.insert(idx, child)
@@ -1359,65 +2084,44 @@ def create_modified_document(
                 parent.remove(ins_elem)
 
         # Remove rPrChange
-        for rpr in root.findall('.//' + W + 'rPrChange'):
+        for rpr in list(root.iter(W_RPR_CHANGE)):
             parent = rpr.getparent()
             if parent is not None:
                 parent.remove(rpr)
 
-        tree.write(str(doc_xml_path), xml_declaration=True, encoding='UTF-8', standalone=True)
-
-        with zipfile.ZipFile(clean_path, 'w', zipfile.ZIP_DEFLATED) as z:
-            for file_path in extract_dir.rglob('*'):
-                if file_path.is_file():
-                    arcname = file_path.relative_to(extract_dir)
-                    z.write(file_path, arcname)
+        # The clean copy only feeds python-docx, so it is built in memory and
+        # stored uncompressed; every other part is copied through unchanged.
+        # lxml serializes the cleaned tree straight into its zip entry rather
+        # than into an intermediate bytes copy of the whole document.
+        clean_docx = io.BytesIO()
+        with zipfile.ZipFile(clean_docx, 'w', zipfile.ZIP_STORED) as dst:
+            for info in src.infolist():
+                if info.is_dir():
+                    continue
+                if info.filename == 'word/document.xml':
+                    with dst.open(info.filename, 'w') as out:
+                        tree.write(out, xml_declaration=True, encoding='UTF-8', standalone=True)
+                else:
+                    dst.writestr(info.filename, src.read(info))
 
         # Step 2: Apply visual diff modifications using python-docx
-        doc = Document(str(clean_path))
-
-        def parse_citation_text(text):
-            """Parse citation text like '49' or '1,' or '19-22,42' into numbers."""
-            nums = []
-            text = text.replace(',', ' ').replace('-', ' - ')
-            parts = text.split()
-            i = 0
-            while i < len(parts):
-                if parts[i].isdigit():
-                    if i + 2 < len(parts) and parts[i + 1] == '-' and parts[i + 2].isdigit():
-                        start, end = int(parts[i]), int(parts[i + 2])
-                        nums.extend(range(start, end + 1))
-                        i += 3
-                    else:
-                        nums.append(int(parts[i]))
-                        i += 1
-                else:
-                    i += 1
-            return nums
-
-        def format_nums(nums):
-            """Format numbers to citation text."""
-            if not nums:
-                return ""
-            if len(nums) == 1:
-                return str(nums[0])
-            result = format_numbers_to_citation(nums)
-            return result.replace('Citations ', '').replace('Citation ', '')
+        doc = Document(clean_docx)
 
         def create_visual_diff_runs(run, text, new_text, is_superscript=True):
             """Replace a run with red strikethrough old + green bold new."""
             run_element = run._element
             parent = run_element.getparent()
-            idx = list(parent).index(run_element)
+            idx = parent.index(run_element)
 
             # RED strikethrough for old
             old_run = OxmlElement('w:r')
             old_rpr = OxmlElement('w:rPr')
             if is_superscript:
                 vert = OxmlElement('w:vertAlign')
-                vert.set(qn('w:val'), 'superscript')
+                vert.set(W_VAL, 'superscript')
                 old_rpr.append(vert)
             color = OxmlElement('w:color')
-            color.set(qn('w:val'), 'FF0000')
+            color.set(W_VAL, 'FF0000')
             old_rpr.append(color)
             strike = OxmlElement('w:strike')
             old_rpr.append(strike)
@@ -1431,10 +2135,10 @@ def create_modified_document(
             new_rpr = OxmlElement('w:rPr')
             if is_superscript:
                 vert2 = OxmlElement('w:vertAlign')
-                vert2.set(qn('w:val'), 'superscript')
+                vert2.set(W_VAL, 'superscript')
                 new_rpr.append(vert2)
             color2 = OxmlElement('w:color')
-            color2.set(qn('w:val'), '008000')
+            color2.set(W_VAL, '008000')
             new_rpr.append(color2)
             bold = OxmlElement('w:b')
             new_rpr.append(bold)
@@ -1476,34 +2180,17 @@ def create_modified_document(
                 if orig_nums == new_nums:
                     continue
 
-                new_text = format_nums(new_nums) + trailing
+                new_text = format_citation_numbers(new_nums) + trailing
                 create_visual_diff_runs(run, text, new_text, is_superscript=True)
                 count += 1
 
             return count
 
-        # Process paragraphs
-        para_mods = 0
-        for para in doc.paragraphs:
-            para_mods += process_superscript_runs(para.runs)
-
-        # Process tables
-        table_mods = 0
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    for para in cell.paragraphs:
-                        table_mods += process_superscript_runs(para.runs)
-
-        # Process reference list
-        ref_mods = 0
-        ref_pattern = re.compile(r'^(\d+)\.\s+')
-
-        for para in doc.paragraphs:
-            text = para.text.strip()
-            match = ref_pattern.match(text)
+        def process_reference_entry(para):
+            """Strike a duplicate reference entry or renumber a kept one; returns 0 or 1."""
+            match = REF_ENTRY_PATTERN.match(para.text.strip())
             if not match:
-                continue
+                return 0
 
             ref_num = int(match.group(1))
 
@@ -1514,19 +2201,35 @@ def create_modified_document(
                     # Add red color and strikethrough
                     run.font.color.rgb = RGBColor(0xFF, 0x00, 0x00)
                     run.font.strike = True
-                ref_mods += 1
-            elif ref_num in dense_map and dense_map[ref_num] != ref_num:
+                return 1
+            if ref_num in dense_map and dense_map[ref_num] != ref_num:
                 # This reference needs renumbering
-                new_num = dense_map[ref_num]
+                old_str, new_str = str(ref_num), str(dense_map[ref_num])
                 # Find the first run with the number and modify it
                 for run in para.runs:
-                    if run.text and run.text.strip().startswith(str(ref_num)):
-                        old_text = run.text
-                        new_text = old_text.replace(f"{ref_num}.", f"{new_num}.", 1)
+                    text = run.text
+                    if text and text.strip().startswith(old_str):
                         # Create visual diff for just the number
-                        create_visual_diff_runs(run, str(ref_num), str(new_num), is_superscript=False)
-                        ref_mods += 1
-                        break
+                        create_visual_diff_runs(run, old_str, new_str, is_superscript=False)
+                        return 1
+            return 0
+
+        # Process paragraphs and the reference list in one walk over the body.
+        # Edits stay inside their own paragraph, so each paragraph still has its
+        # citations rewritten before its reference-entry check, as in two passes
+        para_mods = 0
+        ref_mods = 0
+        for para in doc.paragraphs:
+            para_mods += process_superscript_runs(para.runs)
+            ref_mods += process_reference_entry(para)
+
+        # Process tables
+        table_mods = 0
+        for table in doc.tables:
+            for row in table.rows:
+                for cell in row.cells:
+                    for para in cell.paragraphs:
+                        table_mods += process_superscript_runs(para.runs)
 
         doc.save(output_path)
 
@@ -1540,21 +2243,27 @@ def main():
     print(f"Processing: {docx_path}")
 
     xml_str = load_docx_xml(docx_path)
-    author_names = extract_author_names(xml_str)
+    # References and author names come from the same paragraphs; walk them once
+    references, author_names = extract_references_and_authors(docx_path)
+    # Read-only from here on: every pass and pool worker shares the same names
+    author_names = frozenset(author_names)
     print(f"Found {len(author_names)} author names in references")
 
-    table_citations = process_tables(xml_str, author_names)
-    paragraph_results = process_paragraphs(xml_str, author_names)
+    # Tables and paragraphs come from one streaming pass over document.xml.
+    # Extraction is not cached on disk: it takes about 0.1s on the sample, and
+    # a cache keyed on the .docx alone would go stale whenever this script changes.
+    table_citations, paragraph_results = process_document(xml_str, author_names)
 
-    # Extract references and detect duplicates
-    references = extract_references(docx_path)
+    # Detect duplicates among the references found above
     duplicates = detect_duplicate_references(references)
     print(f"Found {len(references)} references, {len(duplicates)} duplicates")
+    # One renumbering map serves both the Section 6 plan and the modified document
+    dense_map = build_densification_map(duplicates, max(references.keys()))
 
     table_count, para_count, conv_count, dup_count, mod_count = generate_markdown(
         table_citations, paragraph_results, str(output_path),
         references=references, duplicates=duplicates,
-        xml_str=xml_str, author_names=author_names
+        xml_str=xml_str, author_names=author_names, dense_map=dense_map,
     )
     print(f"Extracted {table_count} tables with citations")
     print(f"Citation locations to modify: {mod_count}")
@@ -1564,9 +2273,6 @@ def main():
     print(f"Output written to: {output_path}")
 
     # Create modified document with visual diff (red strikethrough old, green bold new)
-    max_ref = max(references.keys())
-    dense_map = build_densification_map(duplicates, max_ref)
-
     modified_docx_path = docx_path.replace('.docx', '_modified.docx')
     para_mods, table_mods, ref_mods = create_modified_document(
         docx_path, modified_docx_path, duplicates, dense_map